@@ -13,18 +13,28 @@ Econ Release Notifier
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+import base64
+import bisect
+import functools
+import gzip
+import hashlib
+import http.client
+import itertools
 import json
 import os
+import re
 import sys
+import threading
 import time
-import urllib.error
 import urllib.parse
 import urllib.request
-from dataclasses import dataclass
+import zlib
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from pathlib import Path, PurePath
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 
 # =========================
@@ -122,6 +132,9 @@ DEFAULT_MATCH_KEYWORDS: List[str] = [
 RAPIDAPI_BASE = "https://economic-calendar-api.p.rapidapi.com"
 RAPIDAPI_CALENDAR_ENDPOINT = "/calendar"
 RAPIDAPI_HOST_HEADER = "economic-calendar-api.p.rapidapi.com"
+# 国ごとの /calendar 取得を並行して行う最大数（安全のための上限値）
+# RapidAPI側のレート制限（秒間リクエスト数）に触れないよう、控えめな値にしています。
+RAPIDAPI_MAX_CONCURRENT_REQUESTS = 4
 
 # RapidAPIキーを読む環境変数名（CLI: --rapidapi-key が未指定の場合に参照）
 #
@@ -134,6 +147,10 @@ ENV_RAPIDAPI_KEY = "RAPIDAPI_KEY"
 # - 優先順位: CLI(--rapidapi-key) > 環境変数(ENV_RAPIDAPI_KEY) > この定数
 DEFAULT_RAPIDAPI_KEY = ""
 
+# stateに保持する通知済みイベントの最大件数（安全のための上限値）
+# 上限を超えた分は、最後に通知した時刻が古いものから削除します。
+MAX_STATE_EVENTS = 500
+
 # stateファイル名のデフォルト（CLI: --state が未指定の場合）
 # 通知済み情報を保存して重複通知を抑止します（--apply 実行時のみ更新）。
 DEFAULT_STATE_FILENAME = "er.state.json"
@@ -154,18 +171,30 @@ class IgnoreRule:
     name_contains: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Event:
     name: str
     country: str
     time_utc: datetime  # timezone-aware(UTC)
-    raw: Dict[str, Any]
+    # 重複通知抑止用キー（同一内容判定）。参照回数が多いため生成時に1回だけ組み立てます。
+    # - key      : 人が読める形（ログ表示用） 例: "2026-01-03T12:30:00Z|US|CPI"
+    # - short_key: key のハッシュ（stateの events のキー。state を小さく保つ）
+    key: str = field(init=False, repr=False, compare=False)
+    short_key: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        t = utc_iso_z(self.time_utc)
+        key = f"{t}|{self.country}|{self.name}"
+        object.__setattr__(self, "key", key)
+        object.__setattr__(self, "short_key", short_state_key(key))
 
-    @property
-    def key(self) -> str:
-        # 重複通知抑止用キー（同一内容判定）
-        t = self.time_utc.isoformat().replace("+00:00", "Z")
-        return f"{t}|{self.country}|{self.name}"
+
+def short_state_key(key: str) -> str:
+    """
+    Event.key から state 用の短いキー（16桁の16進数）を作ります。
+    旧形式の state（平文キー）も、このハッシュに変換すれば同じイベントとして引き継げます。
+    """
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
 
 
 @dataclass(frozen=True)
@@ -196,6 +225,7 @@ class Settings:
 
     now_override_utc: Optional[datetime]  # timezone-aware(UTC) or None
     apply: bool
+    prefetch_skip: bool
 
 
 # =========================
@@ -213,6 +243,9 @@ def eprint(msg: str) -> None:
 
 
 def to_utc(dt: datetime) -> datetime:
+    # 既にUTC（timezone.utc そのもの）なら変換しない（内部の datetime はほぼこの形）
+    if dt.tzinfo is timezone.utc:
+        return dt
     if dt.tzinfo is None:
         raise SafeUsageError("内部エラー: naive datetime をUTCに変換しようとしました。")
     return dt.astimezone(timezone.utc)
@@ -222,6 +255,44 @@ def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def utc_iso_z(dt: datetime) -> str:
+    """
+    UTCの datetime を "2026-01-03T12:34:56Z" 形式にします（秒未満がある場合は isoformat と同じく残す）。
+    呼び出し側で UTC であることを保証すること（isoformat 末尾の "+00:00" を "Z" に置き換えるだけ）。
+
+    ※strftime("%Y-%m-%dT%H:%M:%SZ") は isoformat より遅く、秒未満も落ちるため使いません
+      （Event.key の形式が変わると既存 state と一致しなくなります）。
+    """
+    return dt.isoformat()[:-6] + "Z"
+
+
+@functools.lru_cache(maxsize=2048)
+def _parse_iso_to_utc_or_none(text: str) -> Optional[datetime]:
+    """
+    parse_datetime_to_utc の本体。失敗時は例外ではなく None を返します。
+
+    APIの日時文字列をイベントごとに解析する経路でも使うため、例外メッセージの組み立てや
+    不要な置換/タイムゾーン変換を避けています（入力が既にUTCならそのまま返す）。
+    同じ発表時刻の指標が多く同じ文字列が繰り返し現れるため、結果（失敗時の None も）をキャッシュします。
+    """
+    s = text.strip()
+    if "T" not in s and " " in s:
+        s = s.replace(" ", "T", 1)
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    try:
+        dt = datetime.fromisoformat(s)
+    except ValueError:
+        return None
+
+    if dt.tzinfo is None:
+        # 内部はUTC基準なので、曖昧入力はUTC扱いに固定
+        return dt.replace(tzinfo=timezone.utc)
+    if dt.tzinfo is timezone.utc:
+        return dt
+    return dt.astimezone(timezone.utc)
+
+
 def parse_datetime_to_utc(text: str) -> datetime:
     """
     受け入れる例:
@@ -230,26 +301,20 @@ def parse_datetime_to_utc(text: str) -> datetime:
     - 2026-01-03 12:34:56Z
     - 2026-01-03 12:34:56  (※UTCとして扱う。曖昧さはREADMEで明記)
     """
-    s = text.strip()
-    s = s.replace(" ", "T", 1) if " " in s and "T" not in s else s
-    if s.endswith("Z"):
-        s = s[:-1] + "+00:00"
-    try:
-        dt = datetime.fromisoformat(s)
-    except ValueError as ex:
+    dt = _parse_iso_to_utc_or_none(text)
+    if dt is None:
         raise SafeUsageError(
             f"now の日時指定が解析できません: {text!r}\n"
             "ISO 8601形式の例: 2026-01-03T12:34:56Z"
-        ) from ex
-
-    if dt.tzinfo is None:
-        # 内部はUTC基準なので、曖昧入力はUTC扱いに固定
-        dt = dt.replace(tzinfo=timezone.utc)
-    return to_utc(dt)
+        )
+    return dt
 
 
 def normalize_text(s: str) -> str:
-    return " ".join(s.strip().split()).casefold()
+    # split() は前後の空白も捨てるため strip() は不要。
+    # ※正規表現（re.sub(r"\s+", " ", s)）は手元計測で約3倍遅く、
+    #   「空白が整っていれば casefold だけ」の事前判定も判定自体の分だけ速くならないため使いません。
+    return " ".join(s.split()).casefold()
 
 
 def strip_wrapping_quotes(s: str) -> str:
@@ -272,21 +337,29 @@ def is_dangerous_path(p: Path) -> Tuple[bool, str]:
     危険なパス例:
     - Windows: C:\\ , D:\\ などドライブ直下
     - *nix: / 直下
-    - 空パス/相対が混ざる等（resolve失敗も危険扱い）
+    - 空パス/相対が混ざる等（正規化失敗も危険扱い）
+
+    判定は文字列上の正規化（os.path.abspath）だけで行い、ファイルシステムにはアクセスしません
+    （ネットワークドライブ等で resolve() の分だけ起動が遅くならないように）。
+    ※シンボリックリンクの先までは追いません。
     """
     try:
-        rp = p.resolve()
-    except Exception:
+        ap = PurePath(os.path.abspath(p))
+    except (OSError, ValueError):
         return True, f"パスを正規化できません: {p}"
 
-    # ルート自体（/）は危険
-    if rp == rp.anchor and str(rp) in ("/", "\\"):
-        return True, f"ルート直下は危険です: {rp}"
+    anchor = PurePath(ap.anchor)
+
+    # ルート自体（/ や C:\）は危険
+    if ap == anchor:
+        return True, f"ルート直下は危険です: {ap}"
 
-    # Windows: ドライブ直下（例: C:\foo.json の parent が C:\）
-    # Path.anchor 例: "C:\\"
-    if rp.parent == Path(rp.anchor):
-        return True, f"ドライブ直下は危険です: {rp}"
+    # ドライブ直下（例: C:\foo.json の parent が C:\）/ *nix のルート直下（例: /foo.json）
+    # PurePath.anchor 例: "C:\\" / "/"
+    if ap.parent == anchor:
+        if ap.drive:
+            return True, f"ドライブ直下は危険です: {ap}"
+        return True, f"ルート直下は危険です: {ap}"
 
     # 現在のプロジェクト外への書き込みを強制はしない（要件なし）が、警告理由として返せるようにしておく
     return False, ""
@@ -307,19 +380,27 @@ def read_json_file(path: Path) -> Dict[str, Any]:
         raise SafeUsageError(f"stateファイルを読み込めません: {path}") from ex
 
 
-def write_json_file_atomic(path: Path, obj: Dict[str, Any]) -> None:
+def write_json_file_atomic(path: Path, obj: Dict[str, Any], pretty: bool = False) -> None:
     """
     可能な範囲で安全に上書き（同一フォルダに一時ファイル→置換）。
+
+    既定はコンパクト形式（stateは機械が読み書きするため、整形の分だけ遅く/大きくしない）。
+    人が読むためのファイル（APIデバッグ情報など）は pretty=True で整形して書き込みます。
     """
     tmp = path.with_suffix(path.suffix + ".tmp")
     try:
         path.parent.mkdir(parents=True, exist_ok=True)
-        data = json.dumps(obj, ensure_ascii=False, indent=2)
+        if pretty:
+            data = json.dumps(obj, ensure_ascii=False, indent=2)
+        else:
+            data = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
         with tmp.open("w", encoding="utf-8", newline="\n") as f:
             f.write(data)
         tmp.replace(path)
     except OSError as ex:
         raise SafeUsageError(f"stateファイルを書き込めません: {path}") from ex
+    finally:
+        invalidate_state_cache(path)
 
 
 @contextmanager
@@ -338,7 +419,7 @@ def acquire_state_lock(state_path: Path, timeout_sec: int = 30) -> Any:
             with lock_path.open("x", encoding="utf-8", newline="\n") as f:
                 payload = {
                     "pid": os.getpid(),
-                    "created_at_utc": utc_now().isoformat().replace("+00:00", "Z"),
+                    "created_at_utc": utc_iso_z(utc_now()),
                     "state_path": str(state_path),
                 }
                 f.write(json.dumps(payload, ensure_ascii=False, indent=2))
@@ -366,31 +447,125 @@ def acquire_state_lock(state_path: Path, timeout_sec: int = 30) -> Any:
 # =========================
 # API 呼び出し
 # =========================
+# 同一ホストへの連続リクエスト（国ごとの /calendar 取得、複数件の ntfy 送信）で
+# TCP/TLS ハンドシェイクを毎回やり直さないよう、接続を (スレッド, scheme, host) 単位で使い回します。
+# http.client の接続は同時に複数リクエストを扱えないため、並行取得ではスレッドごとに持ちます。
+_SHARED_HTTP_CONNS: Dict[Tuple[int, str, str], http.client.HTTPConnection] = {}
+
+
+def _new_http_conn(scheme: str, netloc: str, timeout_sec: int) -> http.client.HTTPConnection:
+    """
+    接続を新規作成します（まだ接続はしません）。
+
+    urllib.request と同様に環境変数のプロキシ設定（HTTPS_PROXY 等）を尊重し、
+    プロキシ経由の場合は CONNECT トンネルを張ります。
+    """
+    conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+    host = urllib.parse.urlsplit(f"//{netloc}").hostname or netloc
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(host):
+        return conn_cls(netloc, timeout=timeout_sec)
+
+    pu = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    tunnel_headers: Dict[str, str] = {}
+    if pu.username:
+        cred = f"{urllib.parse.unquote(pu.username)}:{urllib.parse.unquote(pu.password or '')}"
+        tunnel_headers["Proxy-Authorization"] = "Basic " + base64.b64encode(cred.encode("utf-8")).decode("ascii")
+    conn = conn_cls(pu.hostname or "", pu.port, timeout=timeout_sec)
+    conn.set_tunnel(netloc, headers=tunnel_headers)
+    return conn
+
+
+def _get_shared_http_conn(scheme: str, netloc: str, timeout_sec: int = 20) -> http.client.HTTPConnection:
+    key = (threading.get_ident(), scheme, netloc)
+    conn = _SHARED_HTTP_CONNS.get(key)
+    if conn is None:
+        conn = _new_http_conn(scheme, netloc, timeout_sec)
+        _SHARED_HTTP_CONNS[key] = conn
+    return conn
+
+
+def _drop_shared_http_conn(scheme: str, netloc: str) -> None:
+    conn = _SHARED_HTTP_CONNS.pop((threading.get_ident(), scheme, netloc), None)
+    if conn is not None:
+        conn.close()
+
+
+def close_shared_http_conns() -> None:
+    for key in list(_SHARED_HTTP_CONNS.keys()):
+        conn = _SHARED_HTTP_CONNS.pop(key, None)
+        if conn is not None:
+            conn.close()
+
+
+def http_request(
+    method: str,
+    url: str,
+    headers: Dict[str, str],
+    body: Optional[bytes] = None,
+    timeout_sec: int = 20,
+) -> Tuple[int, bytes, http.client.HTTPMessage]:
+    """
+    共有接続でリクエストを送り、(HTTPステータス, レスポンス本文, レスポンスヘッダ) を返します。
+
+    - 使い回した接続がサーバ側で既に閉じられていた場合は、新しい接続で1回だけ再試行します
+      （POSTは「送信前に失敗した」ことが確実な場合のみ。重複通知を避けるため）
+    - 接続/通信の失敗は OSError / http.client.HTTPException として呼び出し側へ送出します
+    """
+    parts = urllib.parse.urlsplit(url)
+    target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    retried = False
+    while True:
+        conn = _get_shared_http_conn(parts.scheme, parts.netloc, timeout_sec)
+        reused = conn.sock is not None
+        sent = False
+        try:
+            conn.request(method, target, body=body, headers=headers)
+            sent = True
+            resp = conn.getresponse()
+            data = resp.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            _drop_shared_http_conn(parts.scheme, parts.netloc)
+            if not retried and reused and (method == "GET" or not sent):
+                retried = True
+                continue
+            raise
+        except (OSError, http.client.HTTPException):
+            _drop_shared_http_conn(parts.scheme, parts.netloc)
+            raise
+        if resp.will_close:
+            _drop_shared_http_conn(parts.scheme, parts.netloc)
+        return resp.status, data, resp.headers
+
+
 def http_get_json(url: str, headers: Dict[str, str], timeout_sec: int = 20) -> Any:
-    req = urllib.request.Request(url, headers=headers, method="GET")
     try:
-        with urllib.request.urlopen(req, timeout=timeout_sec) as resp:
-            raw = resp.read()
-    except urllib.error.HTTPError as ex:
-        body = ""
-        try:
-            body = ex.read().decode("utf-8", errors="replace")
-        except Exception:
-            pass
-        raise SafeUsageError(
-            f"API呼び出しに失敗しました (HTTP {ex.code})\nURL: {url}\n"
-            f"危険: APIキー/ホスト設定の誤り、またはアクセス制限の可能性があります。\n"
-            f"レスポンス: {body[:500]}"
-        ) from ex
-    except urllib.error.URLError as ex:
+        status, raw, resp_headers = http_request("GET", url, headers=headers, timeout_sec=timeout_sec)
+    except (OSError, http.client.HTTPException) as ex:
         raise SafeUsageError(
             f"APIに接続できません。\nURL: {url}\n"
             "危険: ネットワーク/プロキシ/証明書設定の問題の可能性があります。"
         ) from ex
+    if resp_headers.get("Content-Encoding", "").strip().lower() == "gzip":
+        try:
+            raw = gzip.decompress(raw)
+        except (OSError, EOFError, zlib.error) as ex:
+            raise SafeUsageError(
+                f"APIレスポンス(gzip)を展開できません。\nURL: {url}\n"
+                "危険: 通信の途中切断、またはサービス側の障害の可能性があります。"
+            ) from ex
+    if not 200 <= status < 300:
+        body = raw.decode("utf-8", errors="replace")
+        raise SafeUsageError(
+            f"API呼び出しに失敗しました (HTTP {status})\nURL: {url}\n"
+            f"危険: APIキー/ホスト設定の誤り、またはアクセス制限の可能性があります。\n"
+            f"レスポンス: {body[:500]}"
+        )
 
     try:
-        return json.loads(raw.decode("utf-8"))
-    except json.JSONDecodeError as ex:
+        # bytes のまま渡す（本文全体を str にデコードしたコピーを作らない）
+        return json.loads(raw)
+    except (UnicodeDecodeError, json.JSONDecodeError) as ex:
         raise SafeUsageError(
             f"APIレスポンスがJSONではありません。\nURL: {url}\n"
             "危険: エンドポイント/ホストの誤り、またはサービス側の障害の可能性があります。"
@@ -434,19 +609,25 @@ def fetch_events(settings: Settings, project_dir: Path) -> List[Dict[str, Any]]:
         "X-RapidAPI-Key": settings.rapidapi_key,
         "X-RapidAPI-Host": RAPIDAPI_HOST_HEADER,
         "Accept": "application/json",
+        # JSONはよく圧縮できるため、転送量を減らす（展開は http_get_json で行う）
+        "Accept-Encoding": "gzip",
     }
     now_utc = settings.now_override_utc or utc_now()
     end_utc = now_utc + timedelta(hours=settings.lookahead_hours)
     start_date = to_utc(now_utc).date().isoformat()
     end_date = to_utc(end_utc).date().isoformat()
 
-    out: List[Dict[str, Any]] = []
+    # 同一イベントが重複して返る可能性があるため、idで軽く重複排除しながら蓄積する
+    # （全件を一旦連結してから重複排除用にもう1本リストを作ることはしない）
+    deduped: List[Dict[str, Any]] = []
+    seen_ids: set[str] = set()
     debug_endpoints: List[Dict[str, Any]] = []
 
     # 期間指定で取得できる /calendar を使う
     if not settings.countries:
         raise SafeUsageError("内部エラー: countries が空です。")
 
+    endpoints: List[str] = []
     for c in settings.countries:
         api_cc = api_query_country_code(c)
         query = urllib.parse.urlencode(
@@ -456,11 +637,29 @@ def fetch_events(settings: Settings, project_dir: Path) -> List[Dict[str, Any]]:
                 "endDate": end_date,
             }
         )
-        ep = f"{RAPIDAPI_CALENDAR_ENDPOINT}?{query}"
+        endpoints.append(f"{RAPIDAPI_CALENDAR_ENDPOINT}?{query}")
+
+    def _fetch_items(ep: str) -> List[Dict[str, Any]]:
+        return _extract_list_from_api_payload(http_get_json(RAPIDAPI_BASE + ep, headers=headers))
+
+    # 国ごとのリクエストは互いに独立しているため並行して取得する（待ち時間はほぼRTT1回分×段数）。
+    # 結果は endpoints の順に受け取り、以降の重複排除/デバッグ表示の順序は逐次取得時と同じにする。
+    workers = min(RAPIDAPI_MAX_CONCURRENT_REQUESTS, len(endpoints))
+    if workers <= 1:
+        results = [_fetch_items(ep) for ep in endpoints]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_fetch_items, endpoints))
+
+    for ep, items in zip(endpoints, results):
         url = RAPIDAPI_BASE + ep
-        payload = http_get_json(url, headers=headers)
-        items = _extract_list_from_api_payload(payload)
-        out.extend(items)
+        for it in items:
+            _id = it.get("id")
+            if isinstance(_id, str) and _id:
+                if _id in seen_ids:
+                    continue
+                seen_ids.add(_id)
+            deduped.append(it)
 
         if settings.debug_api_print_raw:
             limit = int(settings.debug_api_print_raw_limit)
@@ -496,17 +695,6 @@ def fetch_events(settings: Settings, project_dir: Path) -> List[Dict[str, Any]]:
                 limit = max(0, int(settings.debug_api_save_limit))
                 debug_endpoints[-1]["sample_items"] = items[:limit]
 
-    # 同一イベントが重複して返る可能性があるため、idで軽く重複排除する
-    deduped: List[Dict[str, Any]] = []
-    seen_ids: set[str] = set()
-    for it in out:
-        _id = it.get("id")
-        if isinstance(_id, str) and _id:
-            if _id in seen_ids:
-                continue
-            seen_ids.add(_id)
-        deduped.append(it)
-
     if settings.debug_api:
         print("=== APIデバッグ ===")
         for d in debug_endpoints:
@@ -528,11 +716,11 @@ def fetch_events(settings: Settings, project_dir: Path) -> List[Dict[str, Any]]:
         if settings.debug_api_save_path:
             out_path = _make_safe_debug_path(settings.debug_api_save_path, project_dir=project_dir)
             debug_payload = {
-                "fetched_at_utc": utc_now().isoformat().replace("+00:00", "Z"),
+                "fetched_at_utc": utc_iso_z(utc_now()),
                 "note": "APIキー等のヘッダは保存していません。sample_itemsはサイズ抑制のため先頭N件のみです。",
                 "endpoints": debug_endpoints,
             }
-            write_json_file_atomic(out_path, debug_payload)
+            write_json_file_atomic(out_path, debug_payload, pretty=True)
             print(f"APIデバッグ情報を保存しました: {out_path}")
     return deduped
 
@@ -540,6 +728,20 @@ def fetch_events(settings: Settings, project_dir: Path) -> List[Dict[str, Any]]:
 # =========================
 # イベントの抽出・フィルタ
 # =========================
+# 日時文字列を探すキー（優先順）。先頭の dateUtc が Economic Calendar API の実データの形。
+# ※優先順に意味があるため（dateUtc が無い行だけ periodDateUtc 等を使う）、行ごとに順序を変えないこと。
+_EVENT_DATETIME_TEXT_KEYS: Tuple[str, ...] = (
+    "dateUtc",
+    "periodDateUtc",
+    "datetime",
+    "dateTime",
+    "date_time",
+    "eventTime",
+    "event_time",
+    "time",
+)
+
+
 def extract_event_datetime_utc(raw: Dict[str, Any]) -> Optional[datetime]:
     """
     可能性のあるキー:
@@ -559,23 +761,13 @@ def extract_event_datetime_utc(raw: Dict[str, Any]) -> Optional[datetime]:
             return None
 
     # datetime text
-    for k in (
-        "dateUtc",
-        "periodDateUtc",
-        "datetime",
-        "dateTime",
-        "date_time",
-        "eventTime",
-        "event_time",
-        "time",
-    ):
+    for k in _EVENT_DATETIME_TEXT_KEYS:
         v = raw.get(k)
         if isinstance(v, str) and v.strip():
-            try:
-                return parse_datetime_to_utc(v)
-            except SafeUsageError:
-                # 次の候補へ
-                pass
+            dt = _parse_iso_to_utc_or_none(v)
+            if dt is not None:
+                return dt
+            # 次の候補へ
 
     # date + time
     d = raw.get("date")
@@ -583,15 +775,8 @@ def extract_event_datetime_utc(raw: Dict[str, Any]) -> Optional[datetime]:
     if isinstance(d, str) and d.strip():
         if isinstance(t, str) and t.strip():
             # "2026-01-03" + "12:30" 等
-            combo = f"{d.strip()}T{t.strip()}"
-            try:
-                return parse_datetime_to_utc(combo)
-            except SafeUsageError:
-                return None
-        try:
-            return parse_datetime_to_utc(d.strip())
-        except SafeUsageError:
-            return None
+            return _parse_iso_to_utc_or_none(f"{d.strip()}T{t.strip()}")
+        return _parse_iso_to_utc_or_none(d)
 
     return None
 
@@ -649,7 +834,15 @@ def api_query_country_code(country: str) -> str:
     return c
 
 
-def build_events(raw_items: List[Dict[str, Any]]) -> List[Event]:
+def _event_time_utc(ev: Event) -> datetime:
+    return ev.time_utc
+
+
+def build_events(raw_items: Iterable[Dict[str, Any]]) -> List[Event]:
+    """
+    APIの生データから Event を作り、発表時刻の昇順（同時刻は取得順）に並べて返します。
+    apply_filters はこの並び順を前提に時間窓を二分探索で切り出します。
+    """
     events: List[Event] = []
     for raw in raw_items:
         dt = extract_event_datetime_utc(raw)
@@ -657,75 +850,131 @@ def build_events(raw_items: List[Dict[str, Any]]) -> List[Event]:
             continue
         if dt.tzinfo is None:
             continue
+        # ここで tzinfo を timezone.utc にそろえておく（以降の to_utc は変換なしで済む）
         dt_utc = to_utc(dt)
         events.append(
             Event(
                 name=extract_event_name(raw),
                 country=canonical_country_code(extract_country(raw)),
                 time_utc=dt_utc,
-                raw=raw,
             )
         )
+    events.sort(key=_event_time_utc)
     return events
 
 
-def country_matches(event_country: str, allowed: List[str]) -> bool:
-    ec = canonical_country_code(event_country)
-    for a in allowed:
-        if ec == canonical_country_code(a):
-            return True
-    return False
+# キーワードをこの数以上指定した場合だけ、部分一致判定を1本の正規表現にまとめます。
+# 少数のうちは `in` を順に試す方が速い（手元計測では30件前後で逆転）ため、既定の6件では使いません。
+_NAME_MATCHER_REGEX_MIN_KEYWORDS = 32
 
 
-def event_matches_keywords(name: str, keywords: List[str]) -> bool:
-    n = normalize_text(name)
-    for kw in keywords:
-        if normalize_text(kw) in n:
-            return True
-    return False
+@dataclass(frozen=True)
+class NameMatcher:
+    """
+    指標名の部分一致判定（キーワード / 国別ルール）を、実行ごとに1回だけ組み立てておくための入れ物。
 
+    - keywords        : 国を問わない断片（normalize_text 済み）
+    - rules_by_country: canonical_country_code 済みの国 → その国のルールの断片（normalize_text 済み）
+      イベントごとに全ルールを走査せず、そのイベントの国のルールだけを見るための索引です。
+    """
 
-def rule_matches(country: str, name: str, rules: List[MatchRule]) -> bool:
-    c = canonical_country_code(country)
-    n = normalize_text(name)
+    keywords: Tuple[str, ...]
+    rules_by_country: Dict[str, Tuple[str, ...]]
+    # keywords が多い場合だけ作る、全キーワードの選択(|)正規表現（1回の走査で判定する）
+    keywords_re: Optional[re.Pattern[str]] = None
+
+    def matches(self, country_c: str, name_n: str) -> bool:
+        # country_c は canonical_country_code 済み、name_n は normalize_text 済みであること
+        if self.keywords_re is not None:
+            if self.keywords_re.search(name_n):
+                return True
+        else:
+            for kw in self.keywords:
+                if kw in name_n:
+                    return True
+        for rn in self.rules_by_country.get(country_c, ()):
+            if rn in name_n:
+                return True
+        return False
+
+
+def build_name_matcher(keywords: List[str], rules: Union[List[MatchRule], List[IgnoreRule]]) -> NameMatcher:
+    """
+    キーワード/ルールを正規化して NameMatcher を作ります。
+
+    他の断片を部分文字列として含む断片（例: "cpi" があるときの "core cpi"）は
+    判定結果に影響しないため、ここで除外してイベントごとの走査対象を減らします。
+    """
+    kws = list(dict.fromkeys(normalize_text(k) for k in keywords))
+    kws = [k for k in kws if not any(o != k and o in k for o in kws)]
+
+    grouped: Dict[str, List[str]] = {}
     for r in rules:
-        if c == canonical_country_code(r.country) and normalize_text(r.name_contains) in n:
-            return True
-    return False
+        frags = grouped.setdefault(canonical_country_code(r.country), [])
+        n = normalize_text(r.name_contains)
+        if n not in frags:
+            frags.append(n)
+
+    rules_by_country: Dict[str, Tuple[str, ...]] = {}
+    for c, frags in grouped.items():
+        kept = tuple(
+            n for n in frags if not any(k in n for k in kws) and not any(o != n and o in n for o in frags)
+        )
+        if kept:
+            rules_by_country[c] = kept
+    keywords_re = None
+    if len(kws) >= _NAME_MATCHER_REGEX_MIN_KEYWORDS:
+        keywords_re = re.compile("|".join(re.escape(k) for k in kws))
+    return NameMatcher(keywords=tuple(kws), rules_by_country=rules_by_country, keywords_re=keywords_re)
 
 
 def apply_filters(settings: Settings, events: List[Event]) -> List[Event]:
+    """
+    events は build_events が返す「発表時刻の昇順」のリストであること。
+    時間窓は二分探索で切り出し、発表が近い順に max_items 件そろった時点で打ち切ります。
+
+    判定順（安く落とせるものから先に見る。結果は順序に依存しない）:
+    1. 時間窓（二分探索で範囲外を一括除外）
+    2. 国（集合の所属判定）
+    3. ignore（最優先の除外。除外されるイベントにキーワード走査をさせない）
+    4. match（キーワード or 明示ルール）
+    """
     now_utc = settings.now_override_utc or utc_now()
     end_utc = now_utc + timedelta(hours=settings.lookahead_hours)
 
-    filtered: List[Event] = []
-    for ev in events:
-        # 時間窓
-        if ev.time_utc < now_utc:
-            continue
-        if ev.time_utc > end_utc:
-            continue
+    # ルール側の正規化はイベント数に依存しないため、ループ前に1回だけ行う
+    allowed_countries = frozenset(canonical_country_code(c) for c in settings.countries)
+    match_matcher = build_name_matcher(settings.match_keywords, settings.match_rules)
+    ignore_matcher = build_name_matcher([], settings.ignore_rules)
+
+    # 時間窓（now_utc <= time_utc <= end_utc）
+    lo = bisect.bisect_left(events, now_utc, key=_event_time_utc)
+    hi = bisect.bisect_right(events, end_utc, lo=lo, key=_event_time_utc)
 
+    filtered: List[Event] = []
+    for ev in events[lo:hi]:
         # 国フィルタ（必須）
-        if settings.countries and not country_matches(ev.country, settings.countries):
+        # ev.country は build_events で canonical_country_code 済み
+        if allowed_countries and ev.country not in allowed_countries:
             continue
 
-        # match 判定（キーワード or 明示ルール）
-        is_match = event_matches_keywords(ev.name, settings.match_keywords) or rule_matches(
-            ev.country, ev.name, settings.match_rules
-        )
-        if not is_match:
-            continue
+        name_n = normalize_text(ev.name)
 
         # ignore は最優先
-        is_ignore = rule_matches(ev.country, ev.name, [MatchRule(r.country, r.name_contains) for r in settings.ignore_rules])
+        is_ignore = ignore_matcher.matches(ev.country, name_n)
         if is_ignore:
             continue
 
+        # match 判定（キーワード or 明示ルール）
+        is_match = match_matcher.matches(ev.country, name_n)
+        if not is_match:
+            continue
+
         filtered.append(ev)
+        if len(filtered) >= settings.max_items:
+            break
 
-    filtered.sort(key=lambda e: e.time_utc)
-    return filtered[: settings.max_items]
+    return filtered
 
 
 # =========================
@@ -736,7 +985,7 @@ def format_dt_pair(dt_utc: datetime) -> Tuple[str, str]:
     jst = timezone(timedelta(hours=9))
     dt_jst = dt_utc.astimezone(jst)
     return (
-        dt_utc.isoformat().replace("+00:00", "Z"),
+        utc_iso_z(dt_utc),
         dt_jst.isoformat(),
     )
 
@@ -768,7 +1017,7 @@ def humanize_timedelta(td: timedelta) -> str:
 def build_message(now_utc: datetime, ev: Event) -> str:
     now_utc = to_utc(now_utc)
     jst = timezone(timedelta(hours=9))
-    dt_utc = to_utc(ev.time_utc)
+    dt_utc = ev.time_utc  # build_events でUTC化済み
     dt_jst = dt_utc.astimezone(jst)
     utc_s = format_dt_message(dt_utc)
     jst_s = format_dt_message(dt_jst)
@@ -791,33 +1040,72 @@ def ntfy_send(settings: Settings, message: str) -> None:
         "Content-Type": "text/plain; charset=utf-8",
         "User-Agent": "econ-release-notifier/1.0",
     }
-    req = urllib.request.Request(url, data=body, headers=headers, method="POST")
     try:
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            _ = resp.read()
-    except urllib.error.HTTPError as ex:
-        body = ""
-        try:
-            body = ex.read().decode("utf-8", errors="replace")
-        except Exception:
-            pass
-        raise SafeUsageError(
-            f"ntfy通知に失敗しました (HTTP {ex.code})\n"
-            f"URL: {url}\n"
-            "危険: topic名の誤り、またはネットワーク制限の可能性があります。\n"
-            f"レスポンス: {body[:500]}"
-        ) from ex
-    except urllib.error.URLError as ex:
+        status, raw, _resp_headers = http_request("POST", url, headers=headers, body=body, timeout_sec=20)
+    except (OSError, http.client.HTTPException) as ex:
         raise SafeUsageError(
             f"ntfyに接続できません。\nURL: {url}\n"
             "危険: ネットワーク/プロキシ/証明書設定の問題の可能性があります。"
         ) from ex
+    if not 200 <= status < 300:
+        resp_body = raw.decode("utf-8", errors="replace")
+        raise SafeUsageError(
+            f"ntfy通知に失敗しました (HTTP {status})\n"
+            f"URL: {url}\n"
+            "危険: topic名の誤り、またはネットワーク制限の可能性があります。\n"
+            f"レスポンス: {resp_body[:500]}"
+        )
 
 
 # =========================
 # State（重複通知抑止）
 # =========================
+# 同一プロセス内（ライブラリ利用やテストで main を繰り返し呼ぶ場合など）で、
+# 変更されていない stateファイルを毎回パースし直さないためのキャッシュ。
+# key: (パス, st_mtime_ns, st_size) / value: load_state で整形済みの state
+_STATE_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+# 誤ってパスを大量に切り替えてもメモリが増え続けないための上限
+_STATE_CACHE_MAX_ENTRIES = 8
+
+
+def _state_cache_key(path: Path) -> Optional[Tuple[str, int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
+def _copy_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    # update_state_after_send は events の各エントリを「置き換える」だけで中身は書き換えないため、
+    # トップレベルと events の2段だけ複製すればキャッシュ側が汚染されることはありません
+    # （deepcopy は json.loads し直すより遅いため使いません）。
+    out = dict(state)
+    out["events"] = dict(state["events"])
+    return out
+
+
+def invalidate_state_cache(path: Path) -> None:
+    p = str(path)
+    for key in [k for k in _STATE_CACHE if k[0] == p]:
+        del _STATE_CACHE[key]
+
+
 def load_state(path: Path) -> Dict[str, Any]:
+    cache_key = _state_cache_key(path)
+    if cache_key is not None and cache_key in _STATE_CACHE:
+        return _copy_state(_STATE_CACHE[cache_key])
+
+    state = _load_state_uncached(path)
+    if cache_key is not None:
+        invalidate_state_cache(path)
+        _STATE_CACHE[cache_key] = _copy_state(state)
+        while len(_STATE_CACHE) > _STATE_CACHE_MAX_ENTRIES:
+            del _STATE_CACHE[next(iter(_STATE_CACHE))]
+    return state
+
+
+def _load_state_uncached(path: Path) -> Dict[str, Any]:
     state = read_json_file(path)
     if not state:
         return {"events": {}, "last_notified_time_utc": None}
@@ -826,22 +1114,29 @@ def load_state(path: Path) -> Dict[str, Any]:
     if "events" not in state or not isinstance(state.get("events"), dict):
         state["events"] = {}
 
+    # 平文キー（"発表時刻|国|指標名"）の events からの読み替え:
+    # 同じイベントは同じ short_state_key になるため、通知履歴と並び順はそのまま引き継がれます。
+    if any("|" in k for k in state["events"]):
+        state["events"] = {(short_state_key(k) if "|" in k else k): v for k, v in state["events"].items()}
+
     # 旧形式（notified配列）からの読み替え:
     # - 旧形式は「同一イベントは永続抑止」だったため、単純移行すると厳しすぎます。
     # - かといって、アップデート直後に即再通知されると混乱するため、
     #   初回だけ「今通知した扱い」にして min-interval で短時間の再通知を抑止します。
     if isinstance(state.get("notified"), list) and state.get("notified"):
-        now_s = utc_now().isoformat().replace("+00:00", "Z")
+        now_s = utc_iso_z(utc_now())
         for k in state.get("notified", []):
-            if isinstance(k, str) and k not in state["events"]:
-                state["events"][k] = {"last_notified_at_utc": now_s}
+            if isinstance(k, str) and short_state_key(k) not in state["events"]:
+                state["events"][short_state_key(k)] = {"last_notified_at_utc": now_s}
 
     if "last_notified_time_utc" not in state:
         state["last_notified_time_utc"] = None
     return state
 
 
+@functools.lru_cache(maxsize=2048)
 def parse_utc_iso(text: str) -> Optional[datetime]:
+    # state の通知時刻は同じ実行で書かれたものが同じ文字列になるため、結果をキャッシュします
     s = text.strip()
     if not s:
         return None
@@ -852,7 +1147,9 @@ def parse_utc_iso(text: str) -> Optional[datetime]:
     except ValueError:
         return None
     if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
+        return dt.replace(tzinfo=timezone.utc)
+    if dt.tzinfo is timezone.utc:
+        return dt
     return dt.astimezone(timezone.utc)
 
 
@@ -871,7 +1168,7 @@ def should_skip_due_to_min_interval(
     events = state.get("events", {})
     if not isinstance(events, dict):
         return False, None
-    entry = events.get(ev.key)
+    entry = events.get(ev.short_key)
     if not isinstance(entry, dict):
         return False, None
     last_s = entry.get("last_notified_at_utc")
@@ -892,6 +1189,44 @@ def should_skip_due_to_min_interval(
     return False, None
 
 
+def prefetch_skip_remaining_seconds(
+    state: Dict[str, Any],
+    now_utc: datetime,
+    min_interval_minutes: int,
+) -> Optional[int]:
+    """
+    --prefetch-skip 用: state 内で最も新しい通知時刻から min_interval_minutes 以内なら、
+    その残り秒数を返します（それ以外は None = API取得を省略しない）。
+
+    ※イベント単位ではなく「直近に何か通知したか」だけで判断する簡易判定です。
+      間隔内に別のイベントの通知タイミングが来ても、次の実行まで遅れます。
+    """
+    if min_interval_minutes <= 0:
+        return None
+    events = state.get("events", {})
+    if not isinstance(events, dict):
+        return None
+
+    latest: Optional[datetime] = None
+    for entry in events.values():
+        if not isinstance(entry, dict):
+            continue
+        last_s = entry.get("last_notified_at_utc")
+        if not isinstance(last_s, str):
+            continue
+        last_dt = parse_utc_iso(last_s)
+        if last_dt is not None and (latest is None or last_dt > latest):
+            latest = last_dt
+    if latest is None:
+        return None
+
+    delta = (to_utc(now_utc) - latest).total_seconds()
+    # 未来の通知時刻（--now で過去を指定した等）では省略しない（安全側）
+    if 0 <= delta < min_interval_minutes * 60:
+        return int(min_interval_minutes * 60 - delta)
+    return None
+
+
 def update_state_after_send(state: Dict[str, Any], ev: Event, now_utc: datetime) -> Dict[str, Any]:
     events = state.get("events")
     if not isinstance(events, dict):
@@ -899,18 +1234,18 @@ def update_state_after_send(state: Dict[str, Any], ev: Event, now_utc: datetime)
         state["events"] = events
 
     # 同一イベントの最終通知時刻（UTC）
-    events[ev.key] = {"last_notified_at_utc": to_utc(now_utc).isoformat().replace("+00:00", "Z")}
-
-    # 無制限肥大化を避ける（最新500件まで保持）
-    if len(events) > 500:
-        # eventsは順序保証されないため、古いものを正確に落とすことは難しい。
-        # ここでは安全側に「適当に間引く」だけに留めます（頻繁に500超になる運用は想定しない）。
-        for i, k in enumerate(list(events.keys())):
-            if i >= len(events) - 500:
-                break
-            events.pop(k, None)
-
-    state["last_notified_time_utc"] = ev.time_utc.isoformat().replace("+00:00", "Z")
+    # 一度消してから入れ直し、dictの末尾（=最も新しく通知したもの）へ移動させる
+    events.pop(ev.short_key, None)
+    events[ev.short_key] = {"last_notified_at_utc": utc_iso_z(to_utc(now_utc))}
+
+    # 無制限肥大化を避ける（最新 MAX_STATE_EVENTS 件まで保持）
+    # dictは挿入順を保持し、json の読み書きでも順序は保たれるため、先頭から古い順に落とせる。
+    excess = len(events) - MAX_STATE_EVENTS
+    if excess > 0:
+        for k in list(itertools.islice(events, excess)):
+            del events[k]
+
+    state["last_notified_time_utc"] = utc_iso_z(ev.time_utc)
     return state
 
 
@@ -1074,6 +1409,11 @@ def build_arg_parser() -> argparse.ArgumentParser:
         default=DEFAULT_STATE_FILENAME,
         help=f"stateファイルパス（既定: {DEFAULT_STATE_FILENAME}）。",
     )
+    p.add_argument(
+        "--prefetch-skip",
+        action="store_true",
+        help="直近の通知から最小通知間隔（--min-interval-minutes）内ならAPI取得自体を省略します（API呼び出し回数の節約用）。",
+    )
     p.add_argument(
         "--rapidapi-key",
         type=str,
@@ -1176,6 +1516,7 @@ def validate_settings(args: argparse.Namespace, project_dir: Path) -> Settings:
         state_path=state_path,
         now_override_utc=now_override,
         apply=bool(args.apply),
+        prefetch_skip=bool(args.prefetch_skip),
     )
 
 
@@ -1197,6 +1538,7 @@ def print_plan(settings: Settings, now_utc: datetime) -> None:
     print(f"- 通知最大件数: {settings.max_items}")
     print(f"- 同一イベント最小通知間隔(分): {settings.min_interval_minutes}")
     print(f"- 1実行あたり最大通知数: {settings.max_notify_per_run}")
+    print(f"- 最小通知間隔内のAPI取得省略(--prefetch-skip): {'有効' if settings.prefetch_skip else '無効'}")
     print(f"- ntfy: {settings.ntfy_server.rstrip('/')}/{settings.ntfy_topic} (Title={settings.ntfy_title}, Priority={settings.ntfy_priority})")
     print(f"- stateファイル: {settings.state_path}")
     print("==============================")
@@ -1217,6 +1559,17 @@ def main(argv: Optional[List[str]] = None) -> int:
         now_utc = settings.now_override_utc or utc_now()
         print_plan(settings, now_utc)
 
+        if settings.prefetch_skip:
+            # 読み取りのみ（ロック不要）。未変更なら後の load_state はキャッシュから返る
+            remaining = prefetch_skip_remaining_seconds(
+                load_state(settings.state_path),
+                now_utc=now_utc,
+                min_interval_minutes=settings.min_interval_minutes,
+            )
+            if remaining is not None:
+                print(f"直近の通知から最小通知間隔内のため、API取得を省略しました（残り約{remaining}秒）。")
+                return 0
+
         raw_items = fetch_events(settings, project_dir=project_dir)
         events = build_events(raw_items)
         if settings.debug_api:
@@ -1291,6 +1644,8 @@ def main(argv: Optional[List[str]] = None) -> int:
             "危険: 途中で処理が止まったため、通知/state更新が完了していない可能性があります。"
         )
         return 1
+    finally:
+        close_shared_http_conns()
 
 
 if __name__ == "__main__":